@@ -1,9 +1,10 @@
-from lager.handlers import FileHandler, StdErrHandler, StdOutHandler
+from lager.handlers import AsyncHandler, FileHandler, StdErrHandler, StdOutHandler
 from lager.loggers import Logger
 from lager.verbosity import DEBUG, Verbosity
 
 __all__ = [
     "Logger",
+    "AsyncHandler",
     "FileHandler",
     "StdErrHandler",
     "StdOutHandler",
@@ -1,46 +1,175 @@
+import atexit
+import sys
 from abc import ABCMeta
+from collections import deque
+from io import BufferedIOBase, RawIOBase
 from os import PathLike
-from sys import stderr, stdout
-from typing import Any, IO, Protocol, final
+from threading import Condition, Lock, Thread
+from time import monotonic
+from traceback import print_exc
+from typing import IO, Any, Literal, Protocol, final
+from weakref import WeakSet, finalize
 
-from lager.verbosity import INFO, WARNING, Verbosity
+from lager.verbosity import DEBUG, ERROR, INFO, WARNING, Verbosity
+
+_threshold_changes = 0
+
+_live_handlers: "WeakSet[StreamHandler]" = WeakSet()
 
 
 class Handler(Protocol):
     def write(self, message: str, verbosity: Verbosity) -> None: ...
 
 
+def _threshold_version() -> int:
+    return _threshold_changes
+
+
+def _bump_threshold_version() -> None:
+    global _threshold_changes
+
+    _threshold_changes += 1
+
+
+@atexit.register
+def _flush_all() -> None:
+    for handler in list(_live_handlers):
+        try:
+            handler.flush()
+        except Exception:
+            _handle_error()
+
+
 class StreamHandler(metaclass=ABCMeta):
+    __slots__ = (
+        "__weakref__",
+        "_binary",
+        "_buffer",
+        "_buffered",
+        "_finalizer",
+        "_last_flush",
+        "_line_buffered",
+        "_lock",
+        "_min_verbosity",
+        "buffer_size",
+        "encoding",
+        "flush_interval",
+        "stream",
+    )
+
     def __init__(
         self,
         *,
         stream: IO[Any],
         min_verbosity: Verbosity = INFO,
+        buffer_size: int = 0,
+        flush_interval_ms: int = 100,
+        encoding: str = "utf-8",
         **_,
     ) -> None:
         self.stream = stream
+        self.encoding = encoding
+        self._binary = isinstance(stream, (RawIOBase, BufferedIOBase))
+        self._line_buffered = getattr(stream, "line_buffering", False)
         self.min_verbosity = min_verbosity
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._buffer: list[str] = []
+        self._buffered = 0
+        self._last_flush = monotonic()
+        self._lock = Lock()
+        self._finalizer = finalize(
+            self, _write_buffer, stream, self._buffer, encoding, self._binary
+        )
+        _live_handlers.add(self)
+
+    @property
+    def min_verbosity(self) -> Verbosity:
+        return self._min_verbosity
+
+    @min_verbosity.setter
+    def min_verbosity(self, value: Verbosity) -> None:
+        self._min_verbosity = value
+        _bump_threshold_version()
 
     def write(self, message: str, verbosity: Verbosity) -> None:
-        if self.min_verbosity <= verbosity:
-            self.stream.write(message)
-            self.stream.flush()
+        if self._min_verbosity > verbosity:
+            return
+
+        if not self.buffer_size:
+            self.stream.write(
+                message.encode(self.encoding) if self._binary else message
+            )
+            if verbosity >= ERROR and not self._line_buffered:
+                self.stream.flush()
+            return
+
+        with self._lock:
+            self._buffer.append(message)
+            self._buffered += len(message)
+            if (
+                verbosity >= ERROR
+                or self._buffered >= self.buffer_size
+                or monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if getattr(self.stream, "closed", False):
+            self._buffer.clear()
+            self._buffered = 0
+            return
+        if self._buffer:
+            data = "".join(self._buffer)
+            self.stream.write(data.encode(self.encoding) if self._binary else data)
+            self._buffer.clear()
+            self._buffered = 0
+        self.stream.flush()
+        self._last_flush = monotonic()
 
 
 @final
 class StdOutHandler(StreamHandler):
-    def __init__(self, min_verbosity: Verbosity = INFO) -> None:
-        super().__init__(stream=stdout, min_verbosity=min_verbosity)
+    __slots__ = ()
+
+    def __init__(
+        self,
+        min_verbosity: Verbosity = INFO,
+        *,
+        buffer_size: int = 0,
+    ) -> None:
+        super().__init__(
+            stream=sys.stdout,
+            min_verbosity=min_verbosity,
+            buffer_size=buffer_size,
+        )
 
 
 @final
 class StdErrHandler(StreamHandler):
-    def __init__(self, min_verbosity: Verbosity = WARNING) -> None:
-        super().__init__(stream=stderr, min_verbosity=min_verbosity)
+    __slots__ = ()
+
+    def __init__(
+        self,
+        min_verbosity: Verbosity = WARNING,
+        *,
+        buffer_size: int = 0,
+    ) -> None:
+        super().__init__(
+            stream=sys.stderr,
+            min_verbosity=min_verbosity,
+            buffer_size=buffer_size,
+        )
 
 
 @final
 class FileHandler(StreamHandler):
+    __slots__ = ("fh",)
+
     def __init__(
         self,
         path: PathLike,
@@ -48,8 +177,9 @@ class FileHandler(StreamHandler):
         mode: str = "a",
         encoding: str = "utf-8",
         errors: str = "strict",
-        buffering: int = 1,
+        buffering: int = 65536,
         min_verbosity: Verbosity = INFO,
+        buffer_size: int = 0,
     ):
         self.fh = open(
             path,
@@ -58,7 +188,179 @@ class FileHandler(StreamHandler):
             errors=errors,
             buffering=buffering,
         )
-        super().__init__(stream=self.fh, min_verbosity=min_verbosity)
+        super().__init__(
+            stream=self.fh,
+            min_verbosity=min_verbosity,
+            buffer_size=buffer_size,
+        )
+        self._finalizer.detach()
+        self._finalizer = finalize(self, _close_file, self.fh, self._buffer)
+
+    def __enter__(self) -> "FileHandler":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.flush()
+        self._finalizer()
+        _live_handlers.discard(self)
+
+
+def _write_buffer(
+    stream: IO[Any], buffer: list[str], encoding: str, binary: bool
+) -> None:
+    if buffer and not getattr(stream, "closed", False):
+        data = "".join(buffer)
+        stream.write(data.encode(encoding) if binary else data)
+        stream.flush()
+    buffer.clear()
+
+
+def _close_file(fh: IO[str], buffer: list[str]) -> None:
+    if buffer and not fh.closed:
+        fh.write("".join(buffer))
+    fh.close()
+
+
+def _handle_error() -> None:
+    if sys.stderr is None:
+        return
+    try:
+        sys.stderr.write("--- Logging error ---\n")
+        print_exc(file=sys.stderr)
+    except Exception:
+        pass
+
+
+OverflowPolicy = Literal["drop_oldest", "drop_newest", "block"]
+
+
+@final
+class AsyncHandler:
+    __slots__ = (
+        "__weakref__",
+        "_blocked",
+        "_closed",
+        "_cond",
+        "_stopped",
+        "_worker",
+        "batch_size",
+        "flush_interval",
+        "handler",
+        "overflow_policy",
+        "queue",
+        "queue_size",
+    )
+
+    def __init__(
+        self,
+        handler: Handler,
+        *,
+        queue_size: int = 8192,
+        batch_size: int = 128,
+        flush_interval_ms: int = 100,
+        overflow_policy: OverflowPolicy = "drop_newest",
+    ) -> None:
+        if overflow_policy not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError(f"unknown overflow policy: {overflow_policy!r}")
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1: {queue_size!r}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1: {batch_size!r}")
+
+        self.handler = handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.overflow_policy = overflow_policy
+        self.queue_size = queue_size
+        self.queue: deque[tuple[str, Verbosity]] = deque(maxlen=queue_size)
+        self._closed = False
+        self._stopped = False
+        self._blocked = 0
+        self._cond = Condition()
+        self._worker = Thread(target=self._run, name="lager-async", daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    @property
+    def min_verbosity(self) -> Verbosity:
+        return getattr(self.handler, "min_verbosity", DEBUG)
+
+    @min_verbosity.setter
+    def min_verbosity(self, value: Verbosity) -> None:
+        version = _threshold_version()
+        self.handler.min_verbosity = value  # type: ignore[attr-defined]
+        if _threshold_version() == version:
+            _bump_threshold_version()
+
+    def write(self, message: str, verbosity: Verbosity) -> None:
+        if verbosity < self.min_verbosity:
+            return
+
+        with self._cond:
+            queue = self.queue
+            if not self._stopped and len(queue) >= self.queue_size:
+                if self.overflow_policy == "drop_newest":
+                    return
+                if self.overflow_policy == "block":
+                    self._blocked += 1
+                    while len(queue) >= self.queue_size:
+                        self._cond.wait()
+                    self._blocked -= 1
+                    self._enqueue(message, verbosity)
+                    return
+
+            if not self._stopped:
+                self._enqueue(message, verbosity)
+                return
+
+        self.handler.write(message, verbosity)
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+
+        atexit.unregister(self.close)
+        self._worker.join()
+
+    def _enqueue(self, message: str, verbosity: Verbosity) -> None:
+        queue = self.queue
+        queue.append((message, verbosity))
+        if len(queue) >= self.batch_size or len(queue) >= self.queue_size:
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        queue = self.queue
+        while True:
+            with self._cond:
+                if not queue and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                batch = [
+                    queue.popleft() for _ in range(min(len(queue), self.batch_size))
+                ]
+                if not batch and self._closed and not self._blocked:
+                    self._stopped = True
+                    return
+                self._cond.notify_all()
+
+            if batch:
+                self._emit(batch)
+
+    def _emit(self, batch: list[tuple[str, Verbosity]]) -> None:
+        for message, verbosity in batch:
+            try:
+                self.handler.write(message, verbosity)
+            except Exception:
+                _handle_error()
 
-    def __del__(self) -> None:
-        self.fh.close()
+        flush = getattr(self.handler, "flush", None)
+        if flush is not None:
+            try:
+                flush()
+            except Exception:
+                _handle_error()
@@ -1,16 +1,116 @@
-from datetime import UTC, datetime
+from collections.abc import Callable, Iterable
+from string import Formatter
+from time import gmtime, strftime, time
 
-from lager.handlers import Handler
-from lager.verbosity import DEBUG, ERROR, INFO, WARNING, Verbosity
+from lager.handlers import Handler, _threshold_version
+from lager.verbosity import _NAMES, DEBUG, ERROR, INFO, WARNING, Verbosity
+
+Renderer = Callable[[str, str, str], str]
+
+Writer = Callable[[str, Verbosity], None]
+
+_FIELDS = ("time", "verbosity", "message")
+
+_FIELD_NAMES = frozenset(_FIELDS)
+
+_DISABLED = ERROR + 1
+
+
+def _terminate(output: str) -> str:
+    return output if output.endswith("\n") else f"{output}\n"
+
+
+def _compile_template(template: str) -> Renderer:
+    parts: list[str] = []
+    ends_with_newline: bool | None = False
+    condition: str | None = None
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if literal:
+            parts.append(repr(literal))
+            ends_with_newline = literal.endswith("\n")
+            condition = None
+        if field is None:
+            continue
+        if field not in _FIELD_NAMES or spec or conversion:
+            return lambda time, verbosity, message: _terminate(
+                template.format(time=time, verbosity=verbosity, message=message)
+            )
+        parts.append(field)
+        if ends_with_newline is None:
+            condition = f"({field}.endswith('\\n') or (not {field} and {condition}))"
+        elif ends_with_newline:
+            condition = f"({field}.endswith('\\n') or not {field})"
+        else:
+            condition = f"{field}.endswith('\\n')"
+        ends_with_newline = None
+
+    if ends_with_newline is None:
+        parts.append(f"('' if {condition} else '\\n')")
+    elif not ends_with_newline:
+        parts.append(repr("\n"))
+
+    source = f"lambda {', '.join(_FIELDS)}: {' + '.join(parts)}"
+    return eval(source, {"__builtins__": {}})
+
+
+_cached_timestamp: tuple[int, str] = (-1, "")
+
+
+def _timestamp() -> str:
+    global _cached_timestamp
+
+    now = int(time())
+    second, formatted = _cached_timestamp
+    if second != now:
+        formatted = strftime("%Y-%m-%dT%H:%M:%S+0000", gmtime(now))
+        _cached_timestamp = (now, formatted)
+    return formatted
 
 
 class Logger:
+    __slots__ = (
+        "__weakref__",
+        "_handlers",
+        "_min_verbosity",
+        "_render",
+        "_template",
+        "_version",
+        "_writers",
+    )
+
     def __init__(
         self,
         handlers: list[Handler] | None = None,
     ) -> None:
         self._template: str = "{time} {verbosity}: {message}"
-        self.handlers: set[Handler] = set(handlers) if handlers else set()
+        self._render: Renderer = _compile_template(self._template)
+        self._handlers: tuple[Handler, ...] = ()
+        self._writers: tuple[tuple[Verbosity, Writer], ...] = ()
+        self._min_verbosity: int = _DISABLED
+        self._version = -1
+        self._set_handlers(handlers or ())
+
+    @property
+    def handlers(self) -> tuple[Handler, ...]:
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self, handlers: Iterable[Handler]) -> None:
+        self._set_handlers(handlers)
+
+    def add_handler(self, handler: Handler) -> None:
+        self._set_handlers((*self.handlers, handler))
+
+    def remove_handler(self, handler: Handler) -> None:
+        self._set_handlers(h for h in self.handlers if h is not handler)
+
+    def refresh(self) -> None:
+        self._set_handlers(self._handlers)
+
+    def is_enabled_for(self, verbosity: Verbosity) -> bool:
+        if self._version != _threshold_version():
+            self.refresh()
+        return verbosity >= self._min_verbosity
 
     def debug(self, message: str) -> None:
         self._log(DEBUG, message)
@@ -24,16 +124,29 @@ class Logger:
     def error(self, message: str) -> None:
         self._log(ERROR, message)
 
+    def _set_handlers(self, handlers: Iterable[Handler]) -> None:
+        self._version = _threshold_version()
+        writers = [
+            (getattr(h, "min_verbosity", DEBUG), h) for h in dict.fromkeys(handlers)
+        ]
+        writers.sort(key=lambda pair: pair[0])
+        self._handlers = tuple(h for _, h in writers)
+        self._writers = tuple((v, h.write) for v, h in writers)
+        self._min_verbosity = self._writers[0][0] if self._writers else _DISABLED
+
     def _log(self, verbosity: Verbosity, message: str) -> None:
-        context = {
-            "time": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S%z"),
-            "verbosity": str(verbosity),
-            "message": message,
-        }
-
-        output = self._template.format(**context)
-        if not output.endswith("\n"):
-            output = f"{output}\n"
-
-        for handler in self.handlers:
-            handler.write(output, verbosity)
+        if self._version != _threshold_version():
+            self.refresh()
+        if verbosity < self._min_verbosity:
+            return
+
+        output = self._render(
+            _timestamp(),
+            _NAMES[verbosity],
+            message,
+        )
+
+        for min_verbosity, write in self._writers:
+            if min_verbosity > verbosity:
+                break
+            write(output, verbosity)
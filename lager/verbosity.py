@@ -8,7 +8,10 @@ class Verbosity(IntEnum):
     error = 3
 
     def __str__(self) -> str:
-        return self.name.upper()
+        return _NAMES[self]
+
+
+_NAMES: dict[Verbosity, str] = {v: v.name.upper() for v in Verbosity}
 
 
 DEBUG = Verbosity.debug
@@ -1,14 +1,44 @@
-from io import StringIO
+from gc import collect
+from io import BytesIO, StringIO, TextIOWrapper
+from pathlib import Path
+from threading import Event, Thread
+from time import sleep
+from typing import IO, Any
+from weakref import ref
 
-from pytest import fixture
+from pytest import CaptureFixture, fixture, mark, raises
 
-from lager.handlers import StreamHandler
-from lager.verbosity import DEBUG, INFO
+from lager.handlers import (
+    AsyncHandler,
+    FileHandler,
+    StdErrHandler,
+    StdOutHandler,
+    StreamHandler,
+    _threshold_version,
+)
+from lager.loggers import Logger
+from lager.verbosity import DEBUG, ERROR, INFO, WARNING, Verbosity
+
+
+class _flushcounting:
+    flushes = 0
+
+    def flush(self) -> None:
+        self.flushes += 1
+        super().flush()  # type: ignore[misc]
+
+
+class _flushcounter(_flushcounting, StringIO):
+    pass
+
+
+class _linebufferedcounter(_flushcounting, TextIOWrapper):
+    pass
 
 
 class _testhandler(StreamHandler):
-    def __init__(self):
-        super().__init__(stream=StringIO(), min_verbosity=INFO)
+    def __init__(self, stream: IO[Any] | None = None, **kwargs: Any):
+        super().__init__(stream=StringIO() if stream is None else stream, **kwargs)
 
 
 @fixture
@@ -16,13 +46,323 @@ def handler() -> _testhandler:
     return _testhandler()
 
 
-def test_streamhandler_write(handler: StreamHandler) -> None:
-    handler.write("Hello, world!", INFO)
+@mark.parametrize(
+    ("verbosity", "expected"),
+    [
+        (DEBUG, ""),
+        (INFO, "Hello, world!"),
+        (WARNING, "Hello, world!"),
+        (ERROR, "Hello, world!"),
+    ],
+)
+def test_streamhandler_enforces_min_verbosity(
+    handler: StreamHandler, verbosity: Verbosity, expected: str
+) -> None:
+    handler.write("Hello, world!", verbosity)
+    output = handler.stream.getvalue()
+    assert output == expected
+
+
+def test_asynchandler_writes_on_close(handler: StreamHandler) -> None:
+    async_handler = AsyncHandler(handler)
+    async_handler.write("Hello, world!", INFO)
+    async_handler.write("Hello, world!", DEBUG)
+    async_handler.close()
     output = handler.stream.getvalue()
     assert output == "Hello, world!"
 
 
-def test_streamhandler_enforces_min_verbosity(handler: StreamHandler) -> None:
-    handler.write("Hello, world!", DEBUG)
+def test_asynchandler_drops_newest_when_full(handler: StreamHandler) -> None:
+    release = Event()
+    write = handler.write
+
+    def blocking_write(message: str, verbosity: Verbosity) -> None:
+        release.wait()
+        write(message, verbosity)
+
+    handler.write = blocking_write
+    async_handler = AsyncHandler(handler, queue_size=1, batch_size=1)
+    for message in ("a", "b", "c", "d"):
+        async_handler.write(message, INFO)
+    release.set()
+    async_handler.close()
     output = handler.stream.getvalue()
-    assert output == ""
+    assert output.startswith("a")
+    assert "d" not in output
+
+
+def test_asynchandler_rejects_unknown_overflow_policy(handler: StreamHandler) -> None:
+    with raises(ValueError):
+        AsyncHandler(handler, overflow_policy="explode")  # type: ignore[arg-type]
+
+
+@mark.parametrize("option", ["queue_size", "batch_size"])
+def test_asynchandler_rejects_empty_sizes(handler: StreamHandler, option: str) -> None:
+    with raises(ValueError):
+        AsyncHandler(handler, **{option: 0})
+
+
+def test_streamhandler_buffers_until_buffer_size() -> None:
+    handler = _testhandler(buffer_size=10, flush_interval_ms=60_000)
+    handler.write("Hello, ", INFO)
+    assert handler.stream.getvalue() == ""
+    handler.write("world!", INFO)
+    assert handler.stream.getvalue() == "Hello, world!"
+
+
+def test_streamhandler_flush_writes_buffer() -> None:
+    handler = _testhandler(buffer_size=1024, flush_interval_ms=60_000)
+    handler.write("Hello, world!", INFO)
+    handler.flush()
+    assert handler.stream.getvalue() == "Hello, world!"
+
+
+def test_streamhandler_flushes_only_errors() -> None:
+    stream = _flushcounter()
+    handler = _testhandler(stream, min_verbosity=DEBUG)
+    handler.write("Hello, ", INFO)
+    assert stream.flushes == 0
+    handler.write("world!", ERROR)
+    assert stream.flushes == 1
+    assert stream.getvalue() == "Hello, world!"
+
+
+def test_filehandler_close_flushes(tmp_path: Path) -> None:
+    path = tmp_path / "app.log"
+    with FileHandler(path) as handler:
+        handler.write("Hello, world!\n", INFO)
+    assert handler.fh.closed
+    assert path.read_text() == "Hello, world!\n"
+
+
+def test_asynchandler_drops_oldest_when_full(handler: StreamHandler) -> None:
+    async_handler = AsyncHandler(
+        handler,
+        queue_size=2,
+        flush_interval_ms=60_000,
+        overflow_policy="drop_oldest",
+    )
+    for message in ("a", "b", "c"):
+        async_handler.write(message, INFO)
+    async_handler.close()
+    output = handler.stream.getvalue()
+    assert output == "bc"
+
+
+def test_streamhandler_coalesces_buffered_writes() -> None:
+    writes: list[str] = []
+    handler = _testhandler(buffer_size=65536, flush_interval_ms=60_000)
+    handler.stream.write = writes.append
+    for _ in range(1000):
+        handler.write("Hello, world!\n", INFO)
+    handler.flush()
+    assert writes == ["Hello, world!\n" * 1000]
+
+
+def test_streamhandler_encodes_for_binary_streams() -> None:
+    handler = _testhandler(BytesIO())
+    handler.write("안녕하세요", INFO)
+    assert handler.stream.getvalue() == "안녕하세요".encode()
+
+
+def test_streamhandler_encodes_buffer_once_for_binary_streams() -> None:
+    handler = _testhandler(BytesIO(), buffer_size=1024, encoding="utf-16-le")
+    handler.write("Hello, ", INFO)
+    handler.write("world!", INFO)
+    handler.flush()
+    assert handler.stream.getvalue() == "Hello, world!".encode("utf-16-le")
+
+
+def test_streamhandler_accepts_streams_without_closed() -> None:
+    class _stream:
+        def __init__(self) -> None:
+            self.writes: list[str] = []
+
+        def write(self, message: str) -> None:
+            self.writes.append(message)
+
+        def flush(self) -> None:
+            pass
+
+    stream = _stream()
+    handler = _testhandler(stream, buffer_size=1024)
+    handler.write("Hello, world!", INFO)
+    handler.flush()
+    assert stream.writes == ["Hello, world!"]
+
+
+def test_streamhandler_drops_buffer_for_closed_streams() -> None:
+    handler = _testhandler(buffer_size=1024, flush_interval_ms=60_000)
+    handler.write("Hello, world!", INFO)
+    handler.stream.close()
+    handler.flush()
+    assert handler._buffer == []
+
+
+def test_stdouthandler_write(capsys: CaptureFixture[str]) -> None:
+    handler = StdOutHandler()
+    handler.write("Hello, world!\n", INFO)
+    handler.flush()
+    assert capsys.readouterr().out == "Hello, world!\n"
+
+
+def test_stderrhandler_write(capsys: CaptureFixture[str]) -> None:
+    handler = StdErrHandler()
+    handler.write("Hello, world!\n", WARNING)
+    handler.flush()
+    assert capsys.readouterr().err == "Hello, world!\n"
+
+
+def test_streamhandler_skips_flush_on_line_buffered_streams() -> None:
+    raw = BytesIO()
+    stream = _linebufferedcounter(raw, encoding="utf-8", line_buffering=True)
+    handler = _testhandler(stream)
+    handler.write("Hello, world!\n", ERROR)
+    assert stream.flushes == 0
+    assert raw.getvalue() == b"Hello, world!\n"
+
+
+def test_asynchandler_keeps_up_with_burst(handler: StreamHandler) -> None:
+    async_handler = AsyncHandler(handler)
+    logger = Logger(handlers=[async_handler])
+    for _ in range(50_000):
+        logger.info("Hello, world!")
+    async_handler.close()
+    assert handler.stream.getvalue().count("\n") == 50_000
+
+
+def test_asynchandler_block_never_drops(handler: StreamHandler) -> None:
+    started, release = Event(), Event()
+    write = handler.write
+
+    def blocking_write(message: str, verbosity: Verbosity) -> None:
+        started.set()
+        release.wait()
+        write(message, verbosity)
+
+    handler.write = blocking_write
+    async_handler = AsyncHandler(
+        handler, queue_size=1, batch_size=1, overflow_policy="block"
+    )
+    async_handler.write("a", INFO)
+    started.wait()
+    async_handler.write("x", INFO)
+    producer = Thread(target=async_handler.write, args=("y", INFO))
+    producer.start()
+    while not async_handler._blocked:
+        sleep(0.001)
+    release.set()
+    async_handler.close()
+    producer.join()
+    assert sorted(handler.stream.getvalue()) == ["a", "x", "y"]
+
+
+def test_asynchandler_survives_handler_errors(
+    handler: StreamHandler, capsys: CaptureFixture[str]
+) -> None:
+    write = handler.write
+
+    def failing_write(message: str, verbosity: Verbosity) -> None:
+        if message == "boom":
+            raise ValueError(message)
+        write(message, verbosity)
+
+    handler.write = failing_write
+    async_handler = AsyncHandler(handler, batch_size=1)
+    async_handler.write("boom", INFO)
+    async_handler.write("Hello, world!", INFO)
+    async_handler.close()
+    assert handler.stream.getvalue() == "Hello, world!"
+    assert "ValueError: boom" in capsys.readouterr().err
+
+
+def test_streamhandler_buffer_is_thread_safe() -> None:
+    handler = _testhandler(buffer_size=64)
+
+    def produce() -> None:
+        for _ in range(5_000):
+            handler.write("Hello, world!\n", INFO)
+
+    producers = [Thread(target=produce) for _ in range(4)]
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join()
+    handler.flush()
+    assert handler.stream.getvalue().count("\n") == 20_000
+
+
+def test_handlers_support_weak_references(handler: StreamHandler) -> None:
+    async_handler = AsyncHandler(handler)
+    assert ref(handler)() is handler
+    assert ref(async_handler)() is async_handler
+    async_handler.close()
+
+
+def test_unreferenced_handlers_are_collected() -> None:
+    handler_ref = ref(StdErrHandler())
+    assert handler_ref() is None
+
+
+def test_filehandler_closes_file_when_collected(tmp_path: Path) -> None:
+    path = tmp_path / "app.log"
+    handler = FileHandler(path, buffer_size=1024)
+    handler.write("Hello, world!\n", INFO)
+    fh = handler.fh
+    del handler
+    collect()
+    assert fh.closed
+    assert path.read_text() == "Hello, world!\n"
+
+
+@mark.parametrize(
+    "drop",
+    [
+        lambda logger, handler: logger.remove_handler(handler),
+        lambda logger, handler: setattr(logger, "handlers", []),
+    ],
+)
+def test_dropped_handlers_write_buffered_records(drop) -> None:
+    stream = StringIO()
+    handler = _testhandler(stream, buffer_size=1024, flush_interval_ms=60_000)
+    logger = Logger(handlers=[handler])
+    logger.info("Hello, world!")
+    drop(logger, handler)
+    del handler
+    collect()
+    assert stream.getvalue().endswith("INFO: Hello, world!\n")
+
+
+def test_asynchandler_keeps_order_while_closing(handler: StreamHandler) -> None:
+    started, release = Event(), Event()
+    write = handler.write
+
+    def blocking_write(message: str, verbosity: Verbosity) -> None:
+        if message == "a":
+            started.set()
+            release.wait()
+        write(message, verbosity)
+
+    handler.write = blocking_write
+    async_handler = AsyncHandler(handler, batch_size=1)
+    async_handler.write("a", INFO)
+    started.wait()
+    closer = Thread(target=async_handler.close)
+    closer.start()
+    while not async_handler._closed:
+        sleep(0.001)
+    async_handler.write("b", INFO)
+    release.set()
+    closer.join()
+    assert handler.stream.getvalue() == "ab"
+
+
+def test_asynchandler_min_verbosity_bumps_version_once(
+    handler: StreamHandler,
+) -> None:
+    async_handler = AsyncHandler(handler)
+    version = _threshold_version()
+    async_handler.min_verbosity = WARNING
+    assert handler.min_verbosity == WARNING
+    assert _threshold_version() == version + 1
+    async_handler.close()
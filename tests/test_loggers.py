@@ -1,11 +1,13 @@
 import re
+from datetime import UTC, datetime
 from io import StringIO
+from weakref import ref
 
-from pytest import fixture
+from pytest import fixture, mark
 
 from lager.handlers import StreamHandler
-from lager.loggers import Logger
-from lager.verbosity import DEBUG
+from lager.loggers import Logger, _compile_template, _timestamp
+from lager.verbosity import DEBUG, ERROR, WARNING, Verbosity
 
 time_pattern = r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\+\d{4}"
 
@@ -47,3 +49,128 @@ def test_error(handler: StreamHandler, logger: Logger) -> None:
     logger.error("Hello, world!")
     output = handler.stream.getvalue()
     assert re.match(rf"{time_pattern} ERROR: Hello, world!\n", output)
+
+
+def test_skips_formatting_below_min_verbosity(monkeypatch) -> None:
+    handler = _testhandler()
+    handler.min_verbosity = WARNING
+    logger = Logger(handlers=[handler])
+    monkeypatch.setattr(logger, "_render", None)
+    logger.info("Hello, world!")
+    assert handler.stream.getvalue() == ""
+
+
+def test_add_handler_lowers_min_verbosity() -> None:
+    logger = Logger()
+    handler = _testhandler()
+    logger.add_handler(handler)
+    logger.debug("Hello, world!")
+    output = handler.stream.getvalue()
+    assert re.match(rf"{time_pattern} DEBUG: Hello, world!\n", output)
+
+
+def test_remove_handler_raises_min_verbosity(
+    handler: StreamHandler, logger: Logger
+) -> None:
+    logger.remove_handler(handler)
+    logger.debug("Hello, world!")
+    assert handler.stream.getvalue() == ""
+
+
+@mark.parametrize(
+    ("template", "message", "expected"),
+    [
+        ("{time} {verbosity}: {message}", "hi", "T INFO: hi\n"),
+        ("{time} {verbosity}: {message}", "hi\n", "T INFO: hi\n"),
+        ("[{verbosity}] {message} @ {time}", "hi", "[INFO] hi @ T\n"),
+        ("{message}\n", "hi", "hi\n"),
+        ("{{literal}} {message!r:>5}", "hi", "{literal}  'hi'\n"),
+        ("", "hi", "\n"),
+        ("{time}\n{message}", "", "T\n"),
+        ("{time}\n{message}", "hi", "T\nhi\n"),
+        ("{verbosity}{message}", "", "INFO\n"),
+        ("time", "hi", "time\n"),
+    ],
+)
+def test_compile_template(template: str, message: str, expected: str) -> None:
+    render = _compile_template(template)
+    assert render("T", "INFO", message) == expected
+
+
+def test_timestamp_matches_utc_now() -> None:
+    before = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S%z")
+    stamp = _timestamp()
+    after = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S%z")
+    assert re.fullmatch(time_pattern, stamp)
+    assert before <= stamp <= after
+
+
+def test_handlers_sorted_by_min_verbosity() -> None:
+    quiet = _testhandler()
+    quiet.min_verbosity = WARNING
+    loud = _testhandler()
+    logger = Logger(handlers=[quiet, loud, quiet])
+    assert logger.handlers == (loud, quiet)
+    logger.info("Hello, world!")
+    assert loud.stream.getvalue()
+    assert quiet.stream.getvalue() == ""
+
+
+def test_is_enabled_for() -> None:
+    handler = _testhandler()
+    handler.min_verbosity = WARNING
+    logger = Logger(handlers=[handler])
+    assert not logger.is_enabled_for(DEBUG)
+    assert logger.is_enabled_for(WARNING)
+
+
+def test_assigning_handlers_resyncs(handler: StreamHandler, logger: Logger) -> None:
+    replacement = _testhandler()
+    logger.handlers = [replacement]
+    logger.info("Hello, world!")
+    assert handler.stream.getvalue() == ""
+    assert re.match(
+        rf"{time_pattern} INFO: Hello, world!\n", replacement.stream.getvalue()
+    )
+
+
+def test_one_write_per_record() -> None:
+    writes: list[str] = []
+    handler = _testhandler()
+    handler.stream.write = writes.append
+    Logger(handlers=[handler]).info("Hello, world!")
+    assert len(writes) == 1
+    assert writes[0].endswith("Hello, world!\n")
+
+
+def test_lowering_min_verbosity_after_attach() -> None:
+    handler = _testhandler()
+    handler.min_verbosity = WARNING
+    logger = Logger(handlers=[handler])
+    handler.min_verbosity = DEBUG
+    assert logger.is_enabled_for(DEBUG)
+    logger.debug("Hello, world!")
+    output = handler.stream.getvalue()
+    assert re.match(rf"{time_pattern} DEBUG: Hello, world!\n", output)
+
+
+def test_handler_without_min_verbosity() -> None:
+    class _writeonly:
+        def __init__(self) -> None:
+            self.messages: list[str] = []
+
+        def write(self, message: str, verbosity: Verbosity) -> None:
+            self.messages.append(message)
+
+    handler = _writeonly()
+    Logger(handlers=[handler]).debug("Hello, world!")
+    assert len(handler.messages) == 1
+
+
+def test_logger_supports_weak_references(logger: Logger) -> None:
+    assert ref(logger)() is logger
+
+
+def test_logger_without_handlers_is_disabled() -> None:
+    logger = Logger()
+    assert not logger.is_enabled_for(ERROR)
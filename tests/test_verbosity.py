@@ -1,5 +1,3 @@
-import pytest
-
 from lager.verbosity import DEBUG, ERROR, INFO, WARNING, Verbosity
 
 
@@ -7,14 +5,11 @@ def test_ordering():
     assert DEBUG < INFO < WARNING < ERROR
 
 
-@pytest.mark.parametrize(
-    ("enum", "expected"),
-    [
-        (DEBUG, "DEBUG"),
-        (ERROR, "ERROR"),
-        (INFO, "INFO"),
-        (WARNING, "WARNING"),
-    ],
-)
-def test_str(enum: Verbosity, expected: str):
-    assert str(enum) == expected
+def test_str():
+    expected = {DEBUG: "DEBUG", ERROR: "ERROR", INFO: "INFO", WARNING: "WARNING"}
+    assert {enum: str(enum) for enum in Verbosity} == expected
+
+
+def test_compares_as_int():
+    assert isinstance(DEBUG, int)
+    assert DEBUG < 1 <= INFO